@@ -19,7 +19,6 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import sys
 import os
 from pathlib import Path
-from io import BytesIO
 from PyQt6.QtWidgets import (QApplication)
 from PyQt6.QtGui import QIcon
 import ctypes
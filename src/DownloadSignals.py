@@ -1,8 +1,9 @@
-from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from PyQt6.QtCore import pyqtSignal, QObject
 
 # Class for handling signals between threads
 class DownloadSignals(QObject):
-    progress = pyqtSignal(float)
-    finished = pyqtSignal(str, str)  # file_path, transcript
+    progress = pyqtSignal(int)  # percent, 0-100
+    finished = pyqtSignal(str, str, str)  # file_path, transcript, error (transcription or MP3 conversion)
     error = pyqtSignal(str)
-    status = pyqtSignal(str)
\ No newline at end of file
+    status = pyqtSignal(str)
+    segment = pyqtSignal(str)  # transcribed segment text
\ No newline at end of file
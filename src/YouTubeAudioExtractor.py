@@ -1,25 +1,66 @@
 import sys
 import os
-import uuid
+import re
+import gc
 import shutil
 from pathlib import Path
 import threading
+import queue
 import subprocess
-import requests
-import zipfile
 import platform
 import time
+import ctypes
+import itertools
+from io import BytesIO
 
-import yt_dlp
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                             QProgressBar, QFileDialog, QMessageBox, QStatusBar,
-                            QCheckBox, QTextEdit)
+                            QCheckBox, QTextEdit, QSpinBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon, QFont, QColor, QPalette
+from PyQt6.QtGui import QFont, QColor, QPalette, QTextCursor
 
 from src.DownloadSignals import DownloadSignals
 
+# Accepted YouTube URL forms, checked before starting a download
+_YT_RE = re.compile(r"^(https?://)?(www\.|m\.|music\.)?(youtube\.com/(watch\?(?:[^#]*&)?v=|shorts/|embed/|live/)|youtu\.be/)[\w\-]{6,}", re.IGNORECASE)
+
+# Title sanitization patterns: hashtags and trailing content, unsafe characters, whitespace runs
+_HASHTAG_RE = re.compile(r'#.*$')
+_TITLE_RE = re.compile(r'[^\w\s\-\.\(\)]')
+_WS_RE = re.compile(r'\s+')
+# Errors raised by CTranslate2 when the CUDA runtime libraries can't be used
+_CUDA_ERROR_RE = re.compile(r'cuda|cublas|cudnn', re.IGNORECASE)
+
+# Transcription model used when the field is empty or holds an unknown name
+_DEFAULT_MODEL = "large-v3-turbo"
+
+# Marker for "FFmpeg location not resolved yet" (None means "use the system FFmpeg")
+_SENTINEL = object()
+
+def _run_parallel(func, items):
+    """Call func on each item in its own daemon thread and return the results in order"""
+    # Daemon threads, unlike ThreadPoolExecutor workers, don't hold up the exit of the app
+    results = [None] * len(items)
+    errors = []
+    
+    def run(index, item):
+        try:
+            results[index] = func(item)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=run, args=(index, item), daemon=True)
+               for index, item in enumerate(items)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    if errors:
+        raise errors[0]
+    return results
+
 class YouTubeAudioExtractor(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -27,12 +68,6 @@ class YouTubeAudioExtractor(QMainWindow):
         # Application directory
         self.app_dir = Path(os.path.dirname(os.path.abspath(__file__))).parent
         
-        # Set application icon
-        icon_path = self.app_dir / "YT_Transcriber.ico" 
-        if icon_path.exists():
-            app_icon = QIcon(str(icon_path))
-            self.setWindowIcon(app_icon)
-        
         # Models directory
         self.models_dir = self.app_dir / "models"
         self.models_dir.mkdir(exist_ok=True)
@@ -45,12 +80,39 @@ class YouTubeAudioExtractor(QMainWindow):
         self.ffmpeg_dir = self.app_dir / "ffmpeg"
         self.ffmpeg_dir.mkdir(exist_ok=True)
         
+        # Resolved FFmpeg location, looked up once per session
+        self._ffmpeg_path_cache = _SENTINEL
+        
+        # yt-dlp instance reused across extractions, created on first use
+        self._ydl = None
+        self._last_progress_emit = [0.0, None]
+        
+        # HTTP session shared by the FFmpeg downloads (keep-alive), created on first use.
+        # The macOS binaries are downloaded in parallel, hence the lock.
+        self._http = None
+        self._http_lock = threading.Lock()
+        
+        # Loaded Whisper models, keyed by (model_size, device, compute_type)
+        self._model_cache = {}
+        
+        # Set when the GPU failed to run a model, the rest of the session uses the CPU
+        self._cuda_failed = False
+        
+        # Single long-lived daemon worker: extractions run one at a time
+        # and never keep the process alive once the window is closed
+        self._jobs = queue.Queue()
+        self._worker_idle = threading.Event()
+        self._worker_idle.set()
+        self._cancel_event = threading.Event()
+        threading.Thread(target=self.run_jobs, daemon=True).start()
+        
         # Signals for thread communication
         self.signals = DownloadSignals()
         self.signals.progress.connect(self.update_progress)
         self.signals.finished.connect(self.process_finished)
         self.signals.error.connect(self.show_error)
         self.signals.status.connect(self.update_status)
+        self.signals.segment.connect(self.append_segment)
         
         # Window configuration
         self.setWindowTitle("YT Transcribe")
@@ -145,15 +207,56 @@ class YouTubeAudioExtractor(QMainWindow):
         model_layout = QHBoxLayout()
         model_layout.addWidget(QLabel("Transcription model:"))
         
-        self.model_selector = QLineEdit("small")
-        self.model_selector.setToolTip("Available models: tiny, base, small, medium, large")
+        self.model_selector = QLineEdit(_DEFAULT_MODEL)
+        self.model_selector.setToolTip("Available models: tiny, base, small, medium, large, "
+                                       "large-v3-turbo, distil-large-v3 (English only)")
         model_layout.addWidget(self.model_selector)
         
-        model_info = QLabel("(tiny=fast, small=balanced, large=accurate)")
+        model_info = QLabel("(tiny=fast, distil/turbo=fast and accurate, large=accurate)")
         model_layout.addWidget(model_info)
         
+        # Beam size (1 = greedy decoding, fastest)
+        model_layout.addWidget(QLabel("Beam size:"))
+        self.beam_size_selector = QSpinBox()
+        self.beam_size_selector.setRange(1, 10)
+        self.beam_size_selector.setValue(1)
+        self.beam_size_selector.setToolTip("1 = fastest, higher values are slower but may be more accurate")
+        model_layout.addWidget(self.beam_size_selector)
+        
         main_layout.addLayout(model_layout)
         
+        # Compute type selection (empty = automatic based on device)
+        compute_layout = QHBoxLayout()
+        compute_layout.addWidget(QLabel("Compute type:"))
+        
+        self.compute_type_selector = QLineEdit()
+        self.compute_type_selector.setPlaceholderText("auto")
+        self.compute_type_selector.setToolTip("Available compute types: int8, int8_float16, float16, float32\n"
+                                              "Leave empty to use int8 on CPU and int8_float16 on CUDA")
+        compute_layout.addWidget(self.compute_type_selector)
+        
+        compute_info = QLabel("(int8=fast on CPU, float16=GPU only)")
+        compute_layout.addWidget(compute_info)
+        
+        # Free the memory used by the cached transcription models
+        self.unload_button = QPushButton("Unload Model")
+        self.unload_button.setToolTip("Release the transcription models kept in memory")
+        self.unload_button.clicked.connect(self.unload_models)
+        compute_layout.addWidget(self.unload_button)
+        
+        self.keep_model_checkbox = QCheckBox("Keep model loaded")
+        self.keep_model_checkbox.setChecked(True)
+        self.keep_model_checkbox.setToolTip("Uncheck to free the model memory after each transcription (slower next time)")
+        compute_layout.addWidget(self.keep_model_checkbox)
+        
+        main_layout.addLayout(compute_layout)
+        
+        # Optionally keep an MP3 copy of the audio (transcription works on the original stream)
+        self.save_mp3_checkbox = QCheckBox("Save audio as MP3")
+        self.save_mp3_checkbox.setChecked(True)
+        self.save_mp3_checkbox.setToolTip("Uncheck to only generate the transcription and skip the MP3 conversion")
+        main_layout.addWidget(self.save_mp3_checkbox)
+        
         # Transcription text area
         self.transcript_label = QLabel("Transcription:")
         main_layout.addWidget(self.transcript_label)
@@ -161,8 +264,13 @@ class YouTubeAudioExtractor(QMainWindow):
         self.transcript_text = QTextEdit()
         self.transcript_text.setReadOnly(True)
         self.transcript_text.setMinimumHeight(150)
+        # Read-only view: no need to keep an undo stack of long transcripts
+        self.transcript_text.setUndoRedoEnabled(False)
         main_layout.addWidget(self.transcript_text)
         
+        # Cursor kept at the end of the document to stream segments in
+        self.transcript_cursor = QTextCursor(self.transcript_text.document())
+        
         # Transcription buttons
         transcript_buttons = QHBoxLayout()
         
@@ -213,8 +321,12 @@ class YouTubeAudioExtractor(QMainWindow):
 
 
     def start_extraction(self):
+        # Only one extraction at a time
+        if not self._worker_idle.is_set():
+            return
+        
         url = self.url_input.text().strip()
-        if not url:
+        if not _YT_RE.match(url):
             self.show_error("Please enter a valid YouTube URL")
             return
         
@@ -225,102 +337,227 @@ class YouTubeAudioExtractor(QMainWindow):
         self.save_button.setEnabled(False)
         self.update_status("Initializing download...")
         
-        # Start download in a separate thread - non serve più il destination_folder
-        threading.Thread(
-            target=self.extract_audio,
-            args=(url,),
-            daemon=True
-        ).start()
+        # Read the settings once, here: Qt widgets must only be accessed from the GUI thread
+        settings = {
+            'model_size': self.model_selector.text().strip(),
+            'compute_type': self.compute_type_selector.text().strip(),
+            'beam_size': self.beam_size_selector.value(),
+            'keep_model': self.keep_model_checkbox.isChecked(),
+            'save_mp3': self.save_mp3_checkbox.isChecked(),
+        }
+        
+        # Start download on the worker thread
+        self._worker_idle.clear()
+        self._jobs.put(lambda: self.extract_audio(url, settings))
+    
+    def run_jobs(self):
+        """Worker thread loop: run queued jobs one after the other"""
+        while True:
+            job = self._jobs.get()
+            try:
+                job()
+            finally:
+                self._worker_idle.set()
+    
+    def closeEvent(self, event):
+        # Stop the running extraction at its next checkpoint; the worker is a daemon
+        # thread, so phases without a checkpoint don't delay the exit
+        self._cancel_event.set()
+        
+        # Close the shared yt-dlp instance (saves cookies, closes its request handlers)
+        # on the worker thread that uses it
+        if self._ydl is not None:
+            ydl_closed = threading.Event()
+            
+            def close_ydl():
+                try:
+                    self._ydl.close()
+                finally:
+                    ydl_closed.set()
+            
+            self._jobs.put(close_ydl)
+            # Wait briefly when the worker is idle, but don't let a running job delay the exit
+            ydl_closed.wait(timeout=2)
+        
+        super().closeEvent(event)
 
-    def extract_audio(self, url):
-        try:
-            # Progress monitoring hook for yt-dlp
-            def progress_hook(d):
-                if d['status'] == 'downloading':
-                    if 'total_bytes' in d and d['total_bytes'] > 0:
-                        percent = (d['downloaded_bytes'] / d['total_bytes']) * 50
-                        self.signals.progress.emit(percent)
-                        self.signals.status.emit(f"Downloading: {percent*2:.1f}%")
-                    elif 'downloaded_bytes' in d:
-                        self.signals.status.emit(f"Downloading: {d['downloaded_bytes'] / 1024 / 1024:.1f} MB")
-                elif d['status'] == 'finished':
-                    self.signals.status.emit("Download completed, extracting audio...")
-                    self.signals.progress.emit(50)
-            
-            # Get FFmpeg path or download if not available
-            ffmpeg_path = self.get_or_download_ffmpeg()
-            
-            # Generate unique ID for this download
-            download_id = uuid.uuid4().hex
-            
-            # Configure yt-dlp options for audio extraction
+    def progress_hook(self, d):
+        """Progress monitoring hook for yt-dlp"""
+        if self._cancel_event.is_set():
+            raise RuntimeError("Extraction cancelled")
+        
+        # Last emission time and percent, used to limit UI updates to ~20 per second
+        last_emit = self._last_progress_emit
+        
+        if d['status'] == 'downloading':
+            now = time.monotonic()
+            if now - last_emit[0] < 0.05:
+                return
+            
+            if 'total_bytes' in d and d['total_bytes'] > 0:
+                percent = round((d['downloaded_bytes'] / d['total_bytes']) * 50, 1)
+                if percent == last_emit[1]:
+                    return
+                last_emit[0] = now
+                last_emit[1] = percent
+                self.signals.progress.emit(int(percent))
+                self.signals.status.emit(f"Downloading: {percent*2:.1f}%")
+            elif 'downloaded_bytes' in d:
+                last_emit[0] = now
+                self.signals.status.emit(f"Downloading: {d['downloaded_bytes'] / 1024 / 1024:.1f} MB")
+        elif d['status'] == 'finished':
+            self.signals.status.emit("Download completed")
+            self.signals.progress.emit(50)
+    
+    def get_youtube_dl(self):
+        """Return the yt-dlp instance shared by all extractions, created on first use"""
+        if self._ydl is None:
+            # Import here to avoid loading its extractors at app startup
+            import yt_dlp
+            
+            # Download the native audio stream (opus/m4a): faster-whisper decodes it directly,
+            # so there is no need to re-encode it before transcribing.
+            # Files are named after the video id, extractions run one at a time.
             ydl_opts = {
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'outtmpl': str(self.temp_dir / f"{download_id}"),
+                'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
+                # Audio formats come from the player response, the DASH manifest is not needed
+                'youtube_include_dash_manifest': False,
+                'outtmpl': str(self.temp_dir / "%(id)s.%(ext)s"),
+            # watch?...&list=...&v= URLs are accepted: download only the video, not the playlist
+            'noplaylist': True,
                 'quiet': True,
                 'no_warnings': True,
-                'progress_hooks': [progress_hook]
+                'progress_hooks': [self.progress_hook]
             }
+            self._ydl = yt_dlp.YoutubeDL(ydl_opts)
+        
+        return self._ydl
+    
+    def extract_audio(self, url, settings):
+        audio_file = None
+        try:
+            save_mp3 = settings['save_mp3']
+            
+            # FFmpeg is only needed for the MP3 conversion
+            ffmpeg_path = self.get_or_download_ffmpeg() if save_mp3 else None
             
-            # Add FFmpeg path if available
-            if ffmpeg_path:
-                ydl_opts['ffmpeg_location'] = ffmpeg_path
+            # Reuse the yt-dlp instance so its setup is paid once per session
+            ydl = self.get_youtube_dl()
+            self._last_progress_emit = [0.0, None]
             
             # Execute download and extract video metadata
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self.signals.status.emit("Retrieving video information...")
-                info = ydl.extract_info(url, download=True)
-                title = info.get('title', 'audio')
+            self.signals.status.emit("Retrieving video information...")
+            info = ydl.extract_info(url, download=True)
+            title = info.get('title', 'audio')
+            video_id = info['id']
             
-            # Locate the downloaded MP3 file - using the download_id
-            mp3_file = self.temp_dir / f"{download_id}.mp3"
+            # yt-dlp reports the real output path, no directory scan needed
+            # (the temp dir can hold partial files of the same video)
+            requested_downloads = info.get('requested_downloads') or [{}]
+            audio_file = Path(requested_downloads[0].get('filepath') or ydl.prepare_filename(info))
             
-            if not mp3_file.exists():
-                self.signals.error.emit("MP3 extraction failed. Check installation.")
+            if not audio_file.exists():
+                self.signals.error.emit("Audio download failed. Check installation.")
                 return
             
-            # Sanitize title for safe file naming
-            import re
-            # Remove hashtags and trailing content
-            clean_title = re.sub(r'#.*$', '', title)
-            # Remove special characters, keep alphanumeric, spaces and basic punctuation
-            clean_title = re.sub(r'[^\w\s\-\.\(\)]', '', clean_title)
-            # Remove multiple spaces and limit length
-            clean_title = ' '.join(clean_title.split()).strip()[:50]
-            
-            # Fallback to generic name if title is empty after cleaning
-            if not clean_title:
-                clean_title = f"audio_{download_id[:8]}"
-            
-            # Create final filename and path
-            safe_filename = f"{clean_title}.mp3"
-            destination_path = self.temp_dir / safe_filename
-            
-            # Copy file with sanitized name
-            shutil.copy2(mp3_file, destination_path)
+            # Start the MP3 conversion first: the FFmpeg process runs alongside the
+            # transcription, which keeps the CPU busy in its own thread pool.
+            # A conversion problem is reported with the transcript, which doesn't need FFmpeg.
+            destination_path = ""
+            conversion_error = ""
+            process = None
+            if save_mp3:
+                ffmpeg_exe = self.find_ffmpeg_executable(ffmpeg_path)
+                if ffmpeg_exe is None:
+                    conversion_error = "FFmpeg not found, the MP3 file was not saved"
+                else:
+                    # Encode under the video id and rename at the end, so a failed
+                    # conversion never leaves a truncated file under the final name
+                    mp3_file = self.temp_dir / f"{video_id}.part.mp3"
+                    try:
+                        process = self.start_mp3_conversion(audio_file, mp3_file, ffmpeg_exe)
+                    except OSError as e:
+                        conversion_error = f"MP3 conversion failed: {str(e)}"
             
             # Generate transcription
-            transcript = ""
             self.signals.status.emit("Starting audio transcription...")
-            transcript = self.transcribe_audio(str(mp3_file))
+            transcript, transcription_error = self.transcribe_audio(str(audio_file), settings)
             
-            # Clean up temporary file
-            os.remove(mp3_file)
+            # Wait for the MP3 conversion to complete
+            if process is not None:
+                if self._cancel_event.is_set():
+                    process.kill()
+                self.signals.status.emit("Finishing MP3 conversion...")
+                _, stderr = process.communicate()
+                if process.returncode != 0:
+                    if mp3_file.exists():
+                        os.remove(mp3_file)
+                    conversion_error = f"MP3 conversion failed: {stderr.decode(errors='replace').strip()}"
+                else:
+                    destination_path = self.temp_dir / self.safe_audio_filename(title, video_id)
+                    
+                    # Move the file to its final name (a rename on the same filesystem, no data copy)
+                    try:
+                        os.replace(mp3_file, destination_path)
+                    except OSError:
+                        shutil.move(mp3_file, destination_path)
             
             # Signal process completion
-            self.signals.finished.emit(str(destination_path), transcript)
+            error = "\n".join(message for message in (transcription_error, conversion_error) if message)
+            self.signals.finished.emit(str(destination_path), transcript, error)
             
         except Exception as e:
             self.signals.error.emit(f"Error during extraction: {str(e)}")
         
+        finally:
+            # Clean up temporary file
+            if audio_file is not None and audio_file.exists():
+                os.remove(audio_file)
+    
+    def safe_audio_filename(self, title, video_id):
+        """Build a filesystem-safe MP3 filename from the video title"""
+        # Sanitize title for safe file naming
+        # Remove hashtags and trailing content
+        clean_title = _HASHTAG_RE.sub('', title)
+        # Remove special characters, keep alphanumeric, spaces and basic punctuation
+        clean_title = _TITLE_RE.sub('', clean_title)
+        # Remove multiple spaces and limit length
+        clean_title = _WS_RE.sub(' ', clean_title).strip()[:50]
+        
+        # Fallback to generic name if title is empty after cleaning
+        if not clean_title:
+            clean_title = f"audio_{video_id[:8]}"
+        
+        return f"{clean_title}.mp3"
+    
+    def find_ffmpeg_executable(self, ffmpeg_path):
+        """Return the FFmpeg executable to run, or None when it can't be found"""
+        if ffmpeg_path:
+            ffmpeg_exe = Path(ffmpeg_path) / ("ffmpeg.exe" if platform.system() == "Windows" else "ffmpeg")
+            if ffmpeg_exe.exists():
+                return str(ffmpeg_exe)
+        
+        # Otherwise use the one installed on the system, if any
+        return shutil.which("ffmpeg")
+    
+    def start_mp3_conversion(self, source, destination, ffmpeg_exe):
+        """Start an FFmpeg process converting the source audio to a 192 kbps MP3"""
+        return subprocess.Popen(
+            [ffmpeg_exe, "-y", "-loglevel", "error", "-i", str(source),
+             "-vn", "-codec:a", "libmp3lame", "-b:a", "192k", str(destination)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            # Don't flash a console window from the GUI on Windows
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+    
     def get_or_download_ffmpeg(self):
         """Get or download FFmpeg based on platform"""
         
+        # Reuse the location found by a previous extraction
+        if self._ffmpeg_path_cache is not _SENTINEL:
+            return self._ffmpeg_path_cache
+        
         # Determine platform and set appropriate paths and download URLs
         system = platform.system()
         
@@ -330,36 +567,31 @@ class YouTubeAudioExtractor(QMainWindow):
             
             # Check if FFmpeg is already downloaded
             if ffmpeg_exe.exists() and ffprobe_exe.exists():
-                return str(self.ffmpeg_dir)
+                self._ffmpeg_path_cache = str(self.ffmpeg_dir)
+                return self._ffmpeg_path_cache
                 
             # Download URL for Windows
             download_url = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-win64-gpl.zip"
             
             try:
                 self.signals.status.emit("Downloading FFmpeg for Windows...")
-                zip_path = self.ffmpeg_dir / "ffmpeg.zip"
                 
-                # Download zip file
-                response = requests.get(download_url, stream=True)
-                with open(zip_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Download zip file into memory, no need to stage it on disk
+                zip_buffer = self.download_to_memory(download_url)
                 
                 # Extract zip file
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    for file in zip_ref.namelist():
-                        if file.endswith('ffmpeg.exe') or file.endswith('ffprobe.exe'):
-                            filename = os.path.basename(file)
-                            source = zip_ref.open(file)
-                            target = open(self.ffmpeg_dir / filename, "wb")
-                            with source, target:
-                                shutil.copyfileobj(source, target)
-                
-                # Remove zip file
-                os.remove(zip_path)
+                import zipfile
+                with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
+                    for info in zip_ref.infolist():
+                        filename = os.path.basename(info.filename)
+                        if filename in ("ffmpeg.exe", "ffprobe.exe"):
+                            # Flatten the archive path so the binary lands directly in ffmpeg_dir
+                            info.filename = filename
+                            zip_ref.extract(info, self.ffmpeg_dir)
                 
                 self.signals.status.emit("FFmpeg installed successfully")
-                return str(self.ffmpeg_dir)
+                self._ffmpeg_path_cache = str(self.ffmpeg_dir)
+                return self._ffmpeg_path_cache
                 
             except Exception as e:
                 self.signals.status.emit(f"Error downloading FFmpeg: {str(e)}")
@@ -371,7 +603,8 @@ class YouTubeAudioExtractor(QMainWindow):
             
             # Check if FFmpeg is already downloaded
             if ffmpeg_bin.exists() and ffprobe_bin.exists():
-                return str(self.ffmpeg_dir)
+                self._ffmpeg_path_cache = str(self.ffmpeg_dir)
+                return self._ffmpeg_path_cache
                 
             # Download URL for macOS
             download_url = "https://evermeet.cx/ffmpeg/getrelease/ffmpeg/zip"
@@ -380,18 +613,16 @@ class YouTubeAudioExtractor(QMainWindow):
             try:
                 self.signals.status.emit("Downloading FFmpeg for macOS...")
                 
-                # Download and extract ffmpeg
-                self.download_and_extract_macos_binary(download_url, "ffmpeg")
-                
-                # Download and extract ffprobe
-                self.download_and_extract_macos_binary(ffprobe_url, "ffprobe")
+                # Download and extract ffmpeg and ffprobe at the same time
+                _run_parallel(self.download_and_extract_macos_binary, [download_url, ffprobe_url])
                 
                 # Make binaries executable
                 os.chmod(ffmpeg_bin, 0o755)
                 os.chmod(ffprobe_bin, 0o755)
                 
                 self.signals.status.emit("FFmpeg installed successfully")
-                return str(self.ffmpeg_dir)
+                self._ffmpeg_path_cache = str(self.ffmpeg_dir)
+                return self._ffmpeg_path_cache
                 
             except Exception as e:
                 self.signals.status.emit(f"Error downloading FFmpeg: {str(e)}")
@@ -399,113 +630,255 @@ class YouTubeAudioExtractor(QMainWindow):
                 
         elif system == "Linux":
             # For Linux, we'll check if FFmpeg is installed system-wide
-            try:
-                subprocess.run(["ffmpeg", "-version"], check=True, capture_output=True)
-                return None  # Use system FFmpeg
-            except:
-                self.signals.status.emit("FFmpeg not found on system. Please install FFmpeg using your package manager.")
+            if shutil.which("ffmpeg") is not None:
+                self._ffmpeg_path_cache = None  # Use system FFmpeg
                 return None
+            
+            self.signals.status.emit("FFmpeg not found on system. Please install FFmpeg using your package manager.")
+            return None
         
         return None
     
-    def download_and_extract_macos_binary(self, url, binary_name):
+    def download_to_memory(self, url, parts=4):
+        """Download a file into memory, using parallel HTTP range requests when supported"""
+        with self._http_lock:
+            if self._http is None:
+                # Import here, only needed the first time FFmpeg is installed
+                import requests
+                self._http = requests.Session()
+        
+        head = self._http.head(url, allow_redirects=True, timeout=(10, 60))
+        size = int(head.headers.get('Content-Length', 0))
+        
+        if head.headers.get('Accept-Ranges') == 'bytes' and size > 0:
+            # Request the ranges from the final URL (GitHub redirects release assets to a CDN)
+            url = head.url
+            data = bytearray(size)
+            part_size = -(-size // parts)
+            
+            def fetch_range(start):
+                end = min(start + part_size, size) - 1
+                response = self._http.get(url, headers={'Range': f"bytes={start}-{end}"}, timeout=(10, 60))
+                # A 200 means the server ignored the range and sent the whole file
+                if response.status_code != 206 or len(response.content) != end - start + 1:
+                    return False
+                data[start:end + 1] = response.content
+                return True
+            
+            if all(_run_parallel(fetch_range, list(range(0, size, part_size)))):
+                return BytesIO(data)
+        
+        # Fallback: single sequential download
+        response = self._http.get(url, stream=True, timeout=(10, 60))
+        response.raise_for_status()
+        response.raw.decode_content = True
+        buffer = BytesIO()
+        shutil.copyfileobj(response.raw, buffer, length=1 << 20)
+        buffer.seek(0)
+        return buffer
+    
+    def download_and_extract_macos_binary(self, url):
         """Helper function to download and extract macOS binaries"""
-        zip_path = self.ffmpeg_dir / f"{binary_name}.zip"
+        # Import here, only needed the first time FFmpeg is installed
+        import zipfile
         
-        # Download zip file
-        response = requests.get(url, stream=True)
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Download zip file into memory, no need to stage it on disk
+        zip_buffer = self.download_to_memory(url)
         
         # Extract zip file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
             zip_ref.extractall(self.ffmpeg_dir)
-        
-        # Remove zip file
-        os.remove(zip_path)
     
-    def transcribe_audio(self, audio_file):
+    def transcribe_audio(self, audio_file, settings):
+        """Transcribe the audio file, returning (transcript, error message or "")"""
+        # Text streamed so far, kept if the transcription fails halfway
+        parts = []
+        
         try:
             self.signals.status.emit("Importing transcription library...")
             self.signals.progress.emit(60)
             
             # Import here to avoid loading at app startup
-            from faster_whisper import WhisperModel
+            import ctranslate2
+            from faster_whisper import available_models
             
             # Ottieni il modello selezionato dall'utente
-            model_size = self.model_selector.text().strip() or "small"
-            self.signals.status.emit(f"Loading transcription model '{model_size}'...")
-            self.signals.progress.emit(70)
+            model_size = settings['model_size'] or _DEFAULT_MODEL
             
-            # Carica il modello
-            model = WhisperModel(
-                model_size, 
-                device="cpu", 
-                compute_type="int8", 
-                download_root=str(self.models_dir)
-            )
+            # Validate the name before it turns into a download attempt from Hugging Face;
+            # local model directories and "org/name" repository ids are passed through
+            if model_size.lower() in available_models():
+                model_size = model_size.lower()
+            elif "/" not in model_size and not os.path.isdir(model_size):
+                self.signals.status.emit(f"Unknown model '{model_size}', using {_DEFAULT_MODEL}")
+                model_size = _DEFAULT_MODEL
             
-            self.signals.status.emit("Starting transcription... (may take several minutes)")
-            self.signals.progress.emit(75)
+            # Use the GPU when available, otherwise run int8 on all CPU cores
+            use_cuda = not self._cuda_failed and ctranslate2.get_cuda_device_count() > 0
+            device = "cuda" if use_cuda else "cpu"
+            default_compute_type = "int8_float16" if device == "cuda" else "int8"
+            compute_type = settings['compute_type'] or default_compute_type
             
-            # Esegui la trascrizione
-            segments_generator, info = model.transcribe(
-                audio_file, 
-                beam_size=5,
-                word_timestamps=False
-            )
+            # Only count the cores this process may actually run on (taskset, containers)
+            if hasattr(os, "sched_getaffinity"):
+                cpu_threads = len(os.sched_getaffinity(0))
+            else:
+                cpu_threads = os.cpu_count() or 1
+            
+            try:
+                model_key, model, segments_generator, info = self.start_transcription(
+                    audio_file, model_size, device, compute_type, cpu_threads, settings)
+            except (RuntimeError, OSError) as e:
+                if device != "cuda" or not _CUDA_ERROR_RE.search(str(e)):
+                    raise
+                
+                # The NVIDIA driver is enough to detect a GPU, but the CUDA libraries
+                # (cuBLAS, cuDNN) are often missing: fall back to the CPU.
+                # An explicit compute type may be what the GPU rejected, so only
+                # skip the GPU for the rest of the session with the default one.
+                if not settings['compute_type']:
+                    self._cuda_failed = True
+                self.signals.status.emit(f"GPU transcription failed ({str(e)}), using the CPU...")
+                device, compute_type = "cpu", "int8"
+                model_key, model, segments_generator, info = self.start_transcription(
+                    audio_file, model_size, device, compute_type, cpu_threads, settings)
             
             # Raccogli i segmenti e monitora il progresso
-            transcript = ""
-            segments = []
-            segment_count = 0
+            total_duration = max(info.duration, 1.0)
+            last_progress = 75
             
-            # Simuliamo il progresso durante la trascrizione
+            # Segments are produced lazily: stream each one to the UI as it arrives
             for segment in segments_generator:
-                segments.append(segment)
-                segment_count += 1
-                transcript += f"{segment.text} "
+                if self._cancel_event.is_set():
+                    break
+                
+                text = segment.text.strip()
+                if text:
+                    self.signals.segment.emit(text)
+                    parts.append(text)
                 
-                # Aggiorna lo stato e il progresso ogni 5 segmenti
-                if segment_count % 5 == 0:
-                    progress_value = 75 + min(segment_count, 100) / 5
-                    if progress_value > 95:
-                        progress_value = 95
+                # Real progress from the position in the audio, updated when the percent changes
+                fraction = min(segment.end / total_duration, 1.0)
+                progress_value = 75 + int(20 * fraction)
+                if progress_value != last_progress:
+                    last_progress = progress_value
                     self.signals.progress.emit(progress_value)
-                    self.signals.status.emit(f"Transcribing: {segment_count} segments processed")
+                    self.signals.status.emit(f"Transcribing: {fraction:.0%} of audio processed")
+            
+            # Release the weights right away when the model should not stay in memory
+            if not settings['keep_model']:
+                self._model_cache.pop(model_key, None)
+                del model, segments_generator
+                self.release_memory()
             
             # Segnala il completamento
             self.signals.progress.emit(95)
             self.signals.status.emit("Transcription completed successfully")
             
-            return transcript.strip()
+            return " ".join(parts), ""
             
         except ImportError:
-            self.signals.status.emit("Installing transcription library...")
+            # Fail fast: installing packages from the worker thread can take minutes
+            return " ".join(parts), "Transcription library not installed. Run: pip install -r requirements.txt"
             
-            # Try to install faster-whisper
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "faster-whisper"])
-                self.signals.status.emit("Library installed, restarting transcription...")
-                return self.transcribe_audio(audio_file)
-            except Exception as e:
-                return f"Error installing transcription library: {str(e)}"
-                
         except Exception as e:
-            error_msg = f"Error during transcription: {str(e)}"
-            self.signals.status.emit(error_msg)
-            return error_msg
+            return " ".join(parts), f"Error during transcription: {str(e)}"
+    
+    def start_transcription(self, audio_file, model_size, device, compute_type, cpu_threads, settings):
+        """Load the model (reusing a cached one) and start transcribing on the given device"""
+        # Import here to avoid loading at app startup
+        from faster_whisper import WhisperModel
+        
+        self.signals.status.emit(f"Loading transcription model '{model_size}' ({device}, {compute_type})...")
+        self.signals.progress.emit(70)
+        
+        # Carica il modello (riusa quello già in memoria se disponibile)
+        model_key = (model_size, device, compute_type)
+        model = self._model_cache.get(model_key)
+        if model is None:
+            model = WhisperModel(
+                model_size, 
+                device=device, 
+                compute_type=compute_type, 
+                cpu_threads=max(1, cpu_threads),
+                num_workers=1,
+                download_root=str(self.models_dir)
+            )
+            if settings['keep_model']:
+                self._model_cache[model_key] = model
+        
+        self.signals.status.emit("Starting transcription... (may take several minutes)")
+        self.signals.progress.emit(75)
+        
+        try:
+            # Esegui la trascrizione
+            # Greedy decoding by default plus VAD: silent intros/outros are skipped entirely
+            segments_generator, info = model.transcribe(
+                audio_file, 
+                beam_size=settings['beam_size'],
+                word_timestamps=False,
+                vad_filter=True,
+                vad_parameters={"min_silence_duration_ms": 500},
+                condition_on_previous_text=False
+            )
+            
+            # Decode the first segment here, so a broken GPU setup fails before any text is streamed
+            first_segment = next(segments_generator, None)
+        except Exception:
+            self._model_cache.pop(model_key, None)
+            raise
+        
+        if first_segment is not None:
+            segments_generator = itertools.chain([first_segment], segments_generator)
+        
+        return model_key, model, segments_generator, info
+    
+    def unload_models(self):
+        """Drop the cached Whisper models to give their memory back"""
+        # A running transcription keeps its own reference and finishes normally
+        self._model_cache.clear()
+        self.release_memory()
+        self.update_status("Transcription models unloaded")
+    
+    def release_memory(self):
+        """Run the garbage collector and give freed heap memory back to the OS"""
+        gc.collect()
+        
+        # glibc keeps freed arenas mapped after large allocations unless asked to trim them
+        if sys.platform.startswith('linux'):
+            try:
+                ctypes.CDLL("libc.so.6").malloc_trim(0)
+            except (OSError, AttributeError):
+                pass
     
     def update_progress(self, value):
-        self.progress_bar.setValue(int(value))
+        self.progress_bar.setValue(value)
     
     def update_status(self, message):
         self.status_bar.showMessage(message)
     
-    def process_finished(self, file_path, transcript):
+    def append_segment(self, text):
+        # Keep following the new text only if the user hasn't scrolled up
+        scroll_bar = self.transcript_text.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        
+        # Insert into the current paragraph instead of append(), which adds a new block per call
+        self.transcript_cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.transcript_text.document().isEmpty():
+            text = f" {text}"
+        self.transcript_cursor.insertText(text)
+        
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+    
+    def process_finished(self, file_path, transcript, error):
         self.extract_button.setEnabled(True)
-        self.update_status(f"Audio extracted successfully: {file_path}")
+        if error:
+            self.update_status(f"Error: {error}")
+        elif file_path:
+            self.update_status(f"Audio extracted successfully: {file_path}")
+        else:
+            self.update_status("Transcription completed")
 
         # Completa la barra di progresso al 100%
         self.progress_bar.setValue(100)
@@ -514,9 +887,9 @@ class YouTubeAudioExtractor(QMainWindow):
         self.current_audio_file = file_path
         self.current_transcript = transcript
         
-        # Show transcription
+        # The transcription has already been streamed into the text area
+        # (current_transcript matches it, also when the transcription failed halfway)
         if transcript:
-            self.transcript_text.setPlainText(transcript)
             self.copy_button.setEnabled(True)
             self.save_button.setEnabled(True)
         
@@ -524,20 +897,32 @@ class YouTubeAudioExtractor(QMainWindow):
         msg_box = QMessageBox()
         msg_box.setWindowTitle("Process Completed")
         
-        if transcript:
+        if error:
+            message = f"The process completed with errors:\n{error}"
+            if transcript:
+                message += "\n\nThe transcribed text is shown."
+            if file_path:
+                message += f"\n\nAudio file saved at:\n{file_path}"
+            msg_box.setText(message)
+        elif not file_path:
+            msg_box.setText("Transcription generated successfully.")
+        elif transcript:
             msg_box.setText(f"Audio extracted and transcription generated successfully.\nFile saved at:\n{file_path}")
         else:
             msg_box.setText(f"Audio extracted successfully.\nFile saved at:\n{file_path}")
         
-        msg_box.setIcon(QMessageBox.Icon.Information)
+        msg_box.setIcon(QMessageBox.Icon.Warning if error else QMessageBox.Icon.Information)
         
-        open_folder_button = msg_box.addButton("Open Folder", QMessageBox.ButtonRole.ActionRole)
+        # Nothing to open when no audio file was saved
+        open_folder_button = None
+        if file_path:
+            open_folder_button = msg_box.addButton("Open Folder", QMessageBox.ButtonRole.ActionRole)
         msg_box.addButton("OK", QMessageBox.ButtonRole.AcceptRole)
         
         msg_box.exec()
         
         # If user clicked "Open Folder"
-        if msg_box.clickedButton() == open_folder_button:
+        if open_folder_button is not None and msg_box.clickedButton() == open_folder_button:
             # Open folder containing the file - cross-platform approach
             folder_path = os.path.dirname(file_path)
             self.open_file_explorer(folder_path)
@@ -571,8 +956,9 @@ class YouTubeAudioExtractor(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.current_transcript)
+                # Encode once and write the bytes directly (segments are joined with spaces, no newlines to translate)
+                with open(file_path, 'wb') as f:
+                    f.write(self.current_transcript.encode('utf-8'))
                 self.update_status(f"Transcription saved to: {file_path}")
             except Exception as e:
                 self.show_error(f"Error saving transcription: {str(e)}")